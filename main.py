@@ -1,13 +1,45 @@
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 import random
 import sys
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from math import log2
 
 
 MIN_DIFFICULTY = 1
 MAX_DIFFICULTY = 60
 
+# Bitmask with bits 1-9 set, one for each digit that can be placed in a cell
+ALL_DIGITS = 0b1111111110
+
+# Lookups between the characters we store on the board and their digit bits, so the solver
+# doesn't need to go through int() and str() for every cell
+CHAR_TO_BIT = {str(num): 1 << num for num in range(1, 10)}
+BIT_TO_CHAR = {1 << num: str(num) for num in range(1, 10)}
+
+
+def build_peers() -> Tuple[Tuple[int, ...], ...]:
+    """
+    For each cell (indexed by row * 9 + col), collects the indices of the 20 other cells which
+    share its row, column or box.
+    """
+    peers = []
+    for idx in range(81):
+        row, col = divmod(idx, 9)
+        start_row, start_col = (row // 3) * 3, (col // 3) * 3
+        cells = {row * 9 + i for i in range(9)} | {i * 9 + col for i in range(9)}
+        cells |= {(start_row + i) * 9 + start_col + j for i in range(3) for j in range(3)}
+        cells.discard(idx)
+        peers.append(tuple(sorted(cells)))
+    return tuple(peers)
+
+
+PEERS = build_peers()
+
+# The box containing each cell, so we don't have to work it out from the row and column every time
+BOX_OF = tuple((idx // 9 // 3) * 3 + (idx % 9) // 3 for idx in range(81))
+
 
 class ANSIEscapeSequences:
     """
@@ -27,65 +59,180 @@ class ANSIEscapeSequences:
     ITALIC = "\x1b[3m"
 
 
-def can_place(board, row, col, num: int):
-    """Checks if placing num at board[row][col] is valid."""
-    for i in range(9):
-        if board[row][i] == str(num) or board[i][col] == str(num):
+# Static text shown at the top of every screen, built once rather than on every redraw
+HEADER_STR = f"{ANSIEscapeSequences.BACKGROUND_BLUE}{ANSIEscapeSequences.FOREGROUND_YELLOW}---=== SUPER SUDOKU ===---{ANSIEscapeSequences.RESET}\n"
+SIGNATURE_STR = f"     {ANSIEscapeSequences.ITALIC}by Dominic Nidy{ANSIEscapeSequences.RESET}\n"
+INVALID_INPUT_STR = f"{ANSIEscapeSequences.BACKGROUND_RED}Invalid input{ANSIEscapeSequences.RESET} "
+
+# Pieces of the board display which don't depend on the board state
+BOARD_TOP_STR = f"{ANSIEscapeSequences.RESET} _________________________\n"
+BOARD_SEPARATOR_STR = " -------------------------\n"
+HIGHLIGHTED_CELL_STR = f" {ANSIEscapeSequences.BACKGROUND_WHITE}{ANSIEscapeSequences.FOREGROUND_BLUE}_{ANSIEscapeSequences.RESET}"
+
+
+def get_board_masks(board) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Builds the row, column and box bitmasks for the board.
+
+    Bit n of rows[r] is set if the digit n is already used in row r, and likewise for cols and boxes.
+    Boxes are numbered left to right, top to bottom.
+    """
+    rows, cols, boxes = [0] * 9, [0] * 9, [0] * 9
+    for idx in range(81):
+        bit = CHAR_TO_BIT.get(board[idx])
+        if bit:
+            rows[idx // 9] |= bit
+            cols[idx % 9] |= bit
+            boxes[BOX_OF[idx]] |= bit
+    return rows, cols, boxes
+
+
+def can_place(masks, idx: int, num: int):
+    """Checks if placing num at board[idx] is valid, using the masks from get_board_masks."""
+    rows, cols, boxes = masks
+    return not ((rows[idx // 9] | cols[idx % 9] | boxes[BOX_OF[idx]]) >> num) & 1
+
+
+def get_free_digits(masks, idx: int) -> int:
+    """Returns a bitmask of every digit which can still be placed at board[idx]."""
+    rows, cols, boxes = masks
+    return ALL_DIGITS & ~(rows[idx // 9] | cols[idx % 9] | boxes[BOX_OF[idx]])
+
+
+def place_digit(masks, idx: int, num: int):
+    """Marks num as used in the row, column and box of board[idx]."""
+    rows, cols, boxes = masks
+    bit = 1 << num
+    rows[idx // 9] |= bit
+    cols[idx % 9] |= bit
+    boxes[BOX_OF[idx]] |= bit
+
+
+def solve_sudoku(board):
+    """
+    Solves the Sudoku board using constraint propagation, falling back to a backtracking search
+    whenever propagation alone can't fill in the rest of the board.
+    """
+    masks = get_board_masks(board)
+
+    # candidates[idx] is the mask of digits that may still go in board[idx]
+    candidates = [0] * 81
+    queue = deque()
+    for idx in range(81):
+        if board[idx] != ".":
+            candidates[idx] = CHAR_TO_BIT[board[idx]]
+            continue
+        free = get_free_digits(masks, idx)
+        if not free:
             return False
-    start_row, start_col = (row // 3) * 3, (col // 3) * 3
-    for i in range(start_row, start_row + 3):
-        for j in range(start_col, start_col + 3):
-            if board[i][j] == str(num):
-                return False
+        candidates[idx] = free
+        # cells with a single candidate are already decided, so propagate them straight away
+        if not free & (free - 1):
+            queue.append(idx)
+
+    if not _propagate(candidates, queue):
+        return False
+    # Try digits in a random order, so solving the same board twice can give different solutions
+    digits = list(range(1, 10))
+    random.shuffle(digits)
+    solved = _search(candidates, [1 << num for num in digits])
+    if solved is None:
+        return False
+
+    for idx in range(81):
+        if board[idx] == ".":
+            board[idx] = BIT_TO_CHAR[solved[idx]]
     return True
 
 
-def solve_sudoku(board):
-    """Solves the Sudoku board using a backtracking approach."""
-    for row in range(9):
-        for col in range(9):
-            if board[row][col] == ".":
-                for num in range(1, 10):
-                    if can_place(board, row, col, num):
-                        board[row][col] = str(num)
-                        if solve_sudoku(board):
-                            return True
-                        board[row][col] = "."
-                return False
+def _propagate(candidates: List[int], queue: deque) -> bool:
+    """
+    Removes the digit of every decided cell in the queue from the candidates of its peers. Any peer
+    left with a single candidate is decided as well, and gets queued up in turn.
+
+    Returns False if some cell ends up with no candidates, meaning the board can't be solved.
+    """
+    while queue:
+        idx = queue.popleft()
+        bit = candidates[idx]
+        for peer in PEERS[idx]:
+            free = candidates[peer]
+            if free & bit:
+                free ^= bit
+                if not free:
+                    return False
+                candidates[peer] = free
+                if not free & (free - 1):
+                    queue.append(peer)
     return True
 
 
-def get_board_display(board, current_cell: Tuple[int, int] | None = None):
+def _search(candidates: List[int], digit_bits: List[int]) -> List[int] | None:
+    """
+    Guesses a digit for the undecided cell with the fewest candidates, propagates it, and recurses.
+    Returns the fully decided candidates, or None if every guess leads to a dead end.
+
+    digit_bits: The bit of each digit, in the order they should be guessed
+    """
+    best, best_count = -1, 10
+    for idx in range(81):
+        count = candidates[idx].bit_count()
+        if 1 < count < best_count:
+            best, best_count = idx, count
+            if count == 2:
+                break
+    if best == -1:
+        # every cell has exactly one candidate left, so the board is solved
+        return candidates
+
+    free = candidates[best]
+    for bit in digit_bits:
+        if not free & bit:
+            continue
+        # work on a copy so a failed guess doesn't need to be undone
+        attempt = candidates[:]
+        attempt[best] = bit
+        if _propagate(attempt, deque([best])):
+            solved = _search(attempt, digit_bits)
+            if solved is not None:
+                return solved
+    return None
+
+
+def get_board_display(board, current_cell: int | None = None):
     """
     From the board state, create a string that formats everything nicely
 
-    current_cell: The cell the user is currently guessing for, if none, no highlighting will be done
+    current_cell: The index of the cell the user is currently guessing for, if none, no highlighting will be done
     """
-    R, C = len(board), len(board[0])
-    board_str = f"{ANSIEscapeSequences.RESET} _________________________\n"
+    # The board is re-rendered unchanged after a wrong guess, so we cache the rendered string
+    # keyed on an immutable snapshot of the board
+    return _render_board(tuple(board), current_cell)
 
-    for i in range(R):
-        row_str = f"{ANSIEscapeSequences.RESET}"
 
-        if i > 0 and i % 3 == 0:
+@lru_cache(maxsize=4)
+def _render_board(board: Tuple[str, ...], current_cell: int | None):
+    """Does the actual formatting for get_board_display."""
+    parts = [BOARD_TOP_STR]
 
-            board_str += f" -------------------------\n"
+    for i in range(9):
+        if i > 0 and i % 3 == 0:
+            parts.append(BOARD_SEPARATOR_STR)
 
-        for j in range(C):
+        row_parts = [ANSIEscapeSequences.RESET]
+        for j, cell in enumerate(board[i * 9 : (i + 1) * 9]):
             if j % 3 == 0:
-                row_str += f" |"
-            if current_cell and i == current_cell[0] and j == current_cell[1]:
-                row_str += f" {ANSIEscapeSequences.BACKGROUND_WHITE}{ANSIEscapeSequences.FOREGROUND_BLUE}"
-                row_str += "_"
-                row_str += f"{ANSIEscapeSequences.RESET}"
+                row_parts.append(" |")
+            if i * 9 + j == current_cell:
+                row_parts.append(HIGHLIGHTED_CELL_STR)
             else:
-                row_str += f" {board[i][j]}"
-        row_str += " | \n"
-        board_str += row_str
+                row_parts.append(f" {cell}")
+        row_parts.append(" | \n")
+        parts.append("".join(row_parts))
 
-    board_str += " -------------------------\n"
+    parts.append(BOARD_SEPARATOR_STR)
 
-    return board_str
+    return "".join(parts)
 
 
 @dataclass
@@ -103,91 +250,77 @@ def validate_sudoku_args(args: SudokuBoardArguments):
     If any invalid parameters were passed, we will update the SudokuBoardArguments object by reference
     """
 
-    # Check if we were passed an integer
-    if type(args.difficulty) != type(1):
+    # Check if we were passed an integer (bool is a subclass of int, but not a valid difficulty)
+    if isinstance(args.difficulty, bool) or not isinstance(args.difficulty, int):
         print(
-            f"Invalid difficulty value {args.difficulty}. We will use a default difficulty of {MIN_DIFFICULTY + (MAX_DIFFICULTY-MIN_DIFFICULTY)//2}"
+            f"Invalid difficulty value {args.difficulty}. We will use a default difficulty of {(MIN_DIFFICULTY + MAX_DIFFICULTY) // 2}"
         )
-        args.difficulty = MIN_DIFFICULTY + (MAX_DIFFICULTY - MIN_DIFFICULTY) // 2
+        args.difficulty = (MIN_DIFFICULTY + MAX_DIFFICULTY) // 2
+        return
 
-    elif args.difficulty < MIN_DIFFICULTY:
+    # Clamp the difficulty into the allowed range
+    clamped = max(MIN_DIFFICULTY, min(MAX_DIFFICULTY, args.difficulty))
+    if clamped != args.difficulty:
         print(
-            f"A difficulty of {args.difficulty} was passed, which is less than the minimum of {MIN_DIFFICULTY}. Automatically updating difficulty to {MIN_DIFFICULTY}."
+            f"A difficulty of {args.difficulty} was passed, which is outside the range of {MIN_DIFFICULTY}-{MAX_DIFFICULTY}. Automatically updating difficulty to {clamped}."
         )
-        args.difficulty = MIN_DIFFICULTY
-    elif args.difficulty > MAX_DIFFICULTY:
-        print(
-            f"A difficulty of {args.difficulty} was passed, which is greater than the maximum of {MAX_DIFFICULTY}. Automatically updating difficulty to {MAX_DIFFICULTY}."
-        )
-        args.difficulty = MAX_DIFFICULTY
+        args.difficulty = clamped
 
 
-def randomize_board(board):
-    """
-    Due to how we generate the solutions for the board, each board will initially have
-    the same numbers in every cell. For instance board[0][0] will always be 1 if it exists,
-    and you could solve the board by placing 1 there if it doesnt.
+def generate_solved_grid() -> List[str]:
+    """Solves an empty board. The solver tries digits in a random order, so the solution is shuffled."""
+    grid = ["."] * 81
+    solve_sudoku(grid)
+    return grid
 
-    This function will simply map all occurances of a value x in the board, to some other value in
-    the interval [1,9]. This will not impact the solvability of the board.
-    """
 
-    # Initialize a hashmap to store the correct conversions for a number x->y
-    convert = {
-        "1": None,
-        "2": None,
-        "3": None,
-        "4": None,
-        "5": None,
-        "6": None,
-        "7": None,
-        "8": None,
-        "9": None,
-    }
-
-    # Initialize a set to store the characters which we can remap numbers to
-    remapable_nums = set(["1", "2", "3", "4", "5", "6", "7", "8", "9"])
-
-    # set to store numbers which have already been used to remap another number
-    for i in range(1, 10):
-        # if the current num was already chosen as a remap target, cont
-        if str(i) not in remapable_nums:
-            continue
+# Solving a board is by far the slowest part of generating a puzzle, so we only do it once at
+# startup, and derive every new puzzle from this grid with shuffle_grid
+BASE_GRID = tuple(generate_solved_grid())
 
-        # after choosing a number, remove i and the picked number from remapable nums
-        map_to = random.choice(list(remapable_nums))
-        remapable_nums.discard(map_to)
-        remapable_nums.discard(str(i))
 
-        # also remove i from remapable nums since we will map map_to to i
-        convert[map_to] = str(i)
-        convert[str(i)] = map_to
+def get_shuffled_line_order() -> List[int]:
+    """
+    Returns a random order for the 9 rows (or columns) of a board. The bands of 3 rows are shuffled,
+    and so are the rows within each band, so each box still ends up with the same cells.
+    """
+    bands = [0, 1, 2]
+    random.shuffle(bands)
+    order = []
+    for band in bands:
+        lines = [band * 3, band * 3 + 1, band * 3 + 2]
+        random.shuffle(lines)
+        order += lines
+    return order
 
-    for i in range(len(board)):
-        for j in range(len(board[0])):
-            # Only remap the value if this cell contains a number
-            board[i][j] = convert[board[i][j]] if board[i][j] != "." else "."
+
+def shuffle_grid(grid) -> List[str]:
+    """
+    Creates a new solved board from a solved grid, by relabelling its digits and reordering its rows
+    and columns with get_shuffled_line_order. None of these can break a row, column or box.
+    """
+    digits = list("123456789")
+    relabelled = digits[:]
+    random.shuffle(relabelled)
+    relabel = dict(zip(digits, relabelled))
+
+    row_order, col_order = get_shuffled_line_order(), get_shuffled_line_order()
+    return [relabel[grid[row * 9 + col]] for row in row_order for col in col_order]
 
 
 def generate_sudoku(args: SudokuBoardArguments):
     """Generates a solvable Sudoku board."""
 
-    # In order to guarantee our board is solvable, we will generate an empty board,
-    # solve that empty board, then remove some cells from it.
-    board = [["." for _ in range(9)] for _ in range(9)]
-    solve_sudoku(board)
+    # In order to guarantee our board is solvable, we start from a solved board, then remove
+    # some cells from it. Shuffling the base grid gives a fresh solved board without re-solving.
+    board = shuffle_grid(BASE_GRID)
 
     # Validate passed arguments, updating them if invalid
     validate_sudoku_args(args)
 
     # Remove some cells to create a puzzle
-    cells_to_remove = args.difficulty
-    while cells_to_remove > 0:
-        row = random.randint(0, 8)
-        col = random.randint(0, 8)
-        if board[row][col] != ".":
-            board[row][col] = "."
-            cells_to_remove -= 1
+    for idx in random.sample(range(81), k=args.difficulty):
+        board[idx] = "."
     return board
 
 
@@ -197,11 +330,14 @@ class TextUIComponent:
         self.text = text
         self.y_index = y_index
         self.x_index = x_index
+        # counted once here, so UIBuffer doesn't have to rescan the text on every draw
+        self._newline_count = text.count("\n")
 
 
 class UIBuffer:
     _instance = None
-    components: List[TextUIComponent] = []
+    # keyed by id() so components can be removed without scanning the whole buffer
+    components: Dict[int, TextUIComponent] = {}
     _previous_lines = 0
 
     def __new__(cls):
@@ -210,35 +346,46 @@ class UIBuffer:
         return cls._instance
 
     @staticmethod
-    def draw():
-        # sort the UI components by y_index first
-        UIBuffer.sort_by_y_index()
-        # render all the components to a string
+    def draw_full():
+        # render all the components to a string, sorted by y_index
         text = UIBuffer.render_to_string()
 
-        # clear only the number of lines used by the previous output
-        UIBuffer.clear_previous_output()
-
-        # print the new UI content
-        print(text, end="")
+        # clear only the number of lines used by the previous output, then print the new UI
+        # content, all in a single write so the terminal is only flushed once per frame
+        sys.stdout.write(UIBuffer.get_clear_previous_output() + text)
+        sys.stdout.flush()
 
         # track the number of lines in the current output for the next draw call
-        UIBuffer._previous_lines = text.count("\n") + 1
+        UIBuffer._previous_lines = (
+            sum(component._newline_count for component in UIBuffer.components.values()) + 1
+        )
 
         # clear the components in the buffer
         UIBuffer.clear()
 
     @staticmethod
-    def add(component: TextUIComponent):
-        UIBuffer.components.append(component)
+    def draw_input_status(text: str):
+        """
+        Rewrites only the input line at the bottom of the last frame drawn by draw_full, leaving
+        everything above it on screen as is.
+
+        Note: text must not contain any newlines, otherwise the line count for the next draw_full desyncs
+        """
+        # the user pressing enter moved the cursor below the input line, so move back up and clear it
+        sys.stdout.write(f"\x1b[1F\x1b[2K{text}")
+        sys.stdout.flush()
 
     @staticmethod
-    def remove(component: TextUIComponent):
-        UIBuffer.components.remove(component)
+    def add(component: TextUIComponent):
+        """
+        Note: components are stored by identity, so adding the same component more than once
+        before a draw will still only render it once
+        """
+        UIBuffer.components[id(component)] = component
 
     @staticmethod
-    def sort_by_y_index():
-        UIBuffer.components.sort(key=lambda component: component.y_index)
+    def remove(component: TextUIComponent):
+        UIBuffer.components.pop(id(component), None)
 
     @staticmethod
     def clear():
@@ -247,18 +394,25 @@ class UIBuffer:
     @staticmethod
     def render_to_string() -> str:
         """
-        Note: explicitly call UIBuffer.sort_by_y_index() before rendering to string
+        Renders the components ordered by y_index. The sort is stable, so components with the same
+        y_index keep the order they were added in.
         """
-        comps_text = [component.text for component in UIBuffer.components]
+        components = sorted(
+            UIBuffer.components.values(), key=lambda component: component.y_index
+        )
+        comps_text = [component.text for component in components]
         return "".join(comps_text)
 
     @staticmethod
-    def clear_previous_output():
-        # move the cursor up by the number of lines in the previous output and clear them
+    def get_clear_previous_output() -> str:
+        """
+        Returns the escape sequence which moves the cursor up by the number of lines in the previous
+        output and clears them
+        """
         if UIBuffer._previous_lines > 0:
-            sys.stdout.write("\x1b[{}F".format(UIBuffer._previous_lines))  # Move up
-            sys.stdout.write("\x1b[J")  # Clear from cursor to end of screen
-            sys.stdout.flush()
+            # Move up, then clear from cursor to end of screen
+            return "\x1b[{}F\x1b[J".format(UIBuffer._previous_lines)
+        return ""
 
 
 def generate_hint(number: int) -> str:
@@ -291,87 +445,72 @@ def play_game(ctx: "SudokuContext", args: SudokuBoardArguments):
     board = generate_sudoku(args)
     guess_count = 0
 
-    randomize_board(board)
+    masks = get_board_masks(board)
 
-    for i in range(len(board)):
-        for j in range(len(board[0])):
-            # we update the cell to _ to indicate what cell we are selecting for
-            while board[i][j] == "." or board[i][j] == "_":
-                board[i][j] = "_"
-                candidate = None
+    # these never change during a game, so the same components are reused for every frame
+    header_component = TextUIComponent(HEADER_STR)
+    signature_component = TextUIComponent(SIGNATURE_STR)
 
-                header_component = TextUIComponent(
-                    f"{ANSIEscapeSequences.BACKGROUND_BLUE}{ANSIEscapeSequences.FOREGROUND_YELLOW}---=== SUPER SUDOKU ===---{ANSIEscapeSequences.RESET}\n"
-                )
-                signature_component = TextUIComponent(
-                    f"     {ANSIEscapeSequences.ITALIC}by Dominic Nidy{ANSIEscapeSequences.RESET}\n"
-                )
-                board_component = TextUIComponent(get_board_display(board, (i, j)), 0)
-                dialog_component = TextUIComponent(
-                    f"What number should we place at {i}, {j} ?: ",
-                    100,
-                )
+    for idx in range(81):
+        row, col = divmod(idx, 9)
+        # we update the cell to _ to indicate what cell we are selecting for
+        while board[idx] == "." or board[idx] == "_":
+            board[idx] = "_"
+            candidate = None
 
-                while not candidate:
-                    UIBuffer.add(header_component)
-                    UIBuffer.add(signature_component)
-                    UIBuffer.add(board_component)
-                    UIBuffer.add(dialog_component)
-                    UIBuffer.draw()
-                    try:
-                        _candidate = int(input())
-                    except KeyboardInterrupt:
-                        exit()
-                    except ValueError:
-                        # * this is a hack, manually incrementing the _newline_count to prevent incorrect inputs from
-                        # * desync-ing the linecounts in our UIBuffer
-                        UIBuffer.add(
-                            TextUIComponent(
-                                f"{ANSIEscapeSequences.BACKGROUND_RED}Invalid input{ANSIEscapeSequences.RESET} ",
-                                5,
-                            )
-                        )
-                        continue
-                    if _candidate <= 0 or _candidate >= 10:
-                        UIBuffer.add(
-                            TextUIComponent(
-                                f"{ANSIEscapeSequences.BACKGROUND_RED}Invalid input{ANSIEscapeSequences.RESET} ",
-                                5,
-                            )
-                        )
-                        continue
-                    else:
-                        candidate = _candidate
-                        guess_count += 1
+            board_component = TextUIComponent(get_board_display(board, idx), 0)
+            dialog_component = TextUIComponent(
+                f"What number should we place at {row}, {col} ?: ",
+                100,
+            )
 
-                if can_place(board, i, j, candidate):
-                    board[i][j] = str(candidate)
+            UIBuffer.add(header_component)
+            UIBuffer.add(signature_component)
+            UIBuffer.add(board_component)
+            UIBuffer.add(dialog_component)
+            UIBuffer.draw_full()
+
+            while not candidate:
+                try:
+                    _candidate = int(input())
+                except KeyboardInterrupt:
+                    exit()
+                except ValueError:
+                    # nothing but the input line changes, so there's no need to redraw the board
+                    UIBuffer.draw_input_status(INVALID_INPUT_STR + dialog_component.text)
+                    continue
+                if _candidate <= 0 or _candidate >= 10:
+                    UIBuffer.draw_input_status(INVALID_INPUT_STR + dialog_component.text)
+                    continue
                 else:
-                    is_solvable = 0
-                    for num in range(1, 10):
-                        if can_place(board, i, j, num):
-
-                            hint_component = TextUIComponent(
-                                f"{generate_hint(num)}\n", 2
-                            )
-                            UIBuffer.add(
-                                TextUIComponent(
-                                    f"{ANSIEscapeSequences.BACKGROUND_RED}WRONG{ANSIEscapeSequences.RESET} ",
-                                    5,
-                                )
-                            )
-                            UIBuffer.add(hint_component)
-                            is_solvable = True
-                            break
-                    if not is_solvable:
-                        print(
-                            f"\n{ANSIEscapeSequences.BACKGROUND_RED}You lost!{ANSIEscapeSequences.RESET}"
-                        )
-                        print(
-                            f"{ANSIEscapeSequences.ITALIC}Why? One of your moves made the board unsolvable. In {ANSIEscapeSequences.BACKGROUND_BLUE}{ANSIEscapeSequences.FOREGROUND_YELLOW}SUPER SUDOKU{ANSIEscapeSequences.RESET}, you\n{ANSIEscapeSequences.ITALIC}cannot undo previous moves."
+                    candidate = _candidate
+                    guess_count += 1
+
+            if can_place(masks, idx, candidate):
+                board[idx] = str(candidate)
+                place_digit(masks, idx, candidate)
+            else:
+                free = get_free_digits(masks, idx)
+                if free:
+                    # hint at the lowest digit which can still go here
+                    num = (free & -free).bit_length() - 1
+                    hint_component = TextUIComponent(f"{generate_hint(num)}\n", 2)
+                    UIBuffer.add(
+                        TextUIComponent(
+                            f"{ANSIEscapeSequences.BACKGROUND_RED}WRONG{ANSIEscapeSequences.RESET} ",
+                            5,
                         )
-                        input("Press enter to continue...")
-                        return -1
+                    )
+                    UIBuffer.add(hint_component)
+                else:
+                    print(
+                        f"\n{ANSIEscapeSequences.BACKGROUND_RED}You lost!{ANSIEscapeSequences.RESET}"
+                    )
+                    print(
+                        f"{ANSIEscapeSequences.ITALIC}Why? One of your moves made the board unsolvable. In {ANSIEscapeSequences.BACKGROUND_BLUE}{ANSIEscapeSequences.FOREGROUND_YELLOW}SUPER SUDOKU{ANSIEscapeSequences.RESET}, you\n{ANSIEscapeSequences.ITALIC}cannot undo previous moves."
+                    )
+                    input("Press enter to continue...")
+                    return -1
 
     score = SudokuScore(guess_count, args.difficulty)
     ctx.add_score(score)
@@ -390,7 +529,7 @@ def play_game(ctx: "SudokuContext", args: SudokuBoardArguments):
             2,
         )
     )
-    UIBuffer.draw()
+    UIBuffer.draw_full()
     input("Press enter to continue...")
 
 
@@ -404,9 +543,6 @@ class SudokuScore:
         self.score /= 15
         self.score = int(self.score)
 
-    def __lt__(self, other: "SudokuScore"):
-        return self.score >= other.score
-
     def __str__(self) -> str:
         return f"{ANSIEscapeSequences.FOREGROUND_WHITER}{self.score}{ANSIEscapeSequences.RESET} {ANSIEscapeSequences.ITALIC}(with {self.guess_count} guess(es) and difficulty of {self.difficulty}){ANSIEscapeSequences.RESET}"
 
@@ -426,14 +562,8 @@ class SudokuContext:
 
 
 def display_menu(ctx: SudokuContext) -> SudokuBoardArguments:
-    header_component = TextUIComponent(
-        f"{ANSIEscapeSequences.BACKGROUND_BLUE}{ANSIEscapeSequences.FOREGROUND_YELLOW}---=== SUPER SUDOKU ===---{ANSIEscapeSequences.RESET}\n",
-        0,
-    )
-    signature_component = TextUIComponent(
-        f"     {ANSIEscapeSequences.ITALIC}by Dominic Nidy{ANSIEscapeSequences.RESET}\n",
-        1,
-    )
+    header_component = TextUIComponent(HEADER_STR, 0)
+    signature_component = TextUIComponent(SIGNATURE_STR, 1)
     options_dialog_component = TextUIComponent(
         f"\n\nSelect difficulty level ({MIN_DIFFICULTY}-{MAX_DIFFICULTY}): ", 100
     )
@@ -444,7 +574,8 @@ def display_menu(ctx: SudokuContext) -> SudokuBoardArguments:
         UIBuffer.add(signature_component)
         UIBuffer.add(options_dialog_component)
         if ctx.has_scores():
-            ctx.scores.sort()
+            # highest scores first
+            ctx.scores.sort(key=lambda score: score.score, reverse=True)
             scores = "\n".join(
                 [f" {i+1}. {ctx.scores[i]}" for i in range(len(ctx.scores))]
             )
@@ -461,18 +592,13 @@ def display_menu(ctx: SudokuContext) -> SudokuBoardArguments:
                     2,
                 )
             )
-        UIBuffer.draw()
+        UIBuffer.draw_full()
 
         try:
             _difficulty = int(input())
 
             if _difficulty < MIN_DIFFICULTY or _difficulty > MAX_DIFFICULTY:
-                UIBuffer.add(
-                    TextUIComponent(
-                        f"{ANSIEscapeSequences.BACKGROUND_RED}Invalid input{ANSIEscapeSequences.RESET} ",
-                        5,
-                    )
-                )
+                UIBuffer.add(TextUIComponent(INVALID_INPUT_STR, 5))
                 continue
             else:
                 sudoku_options = SudokuBoardArguments(_difficulty)
@@ -481,12 +607,7 @@ def display_menu(ctx: SudokuContext) -> SudokuBoardArguments:
         except ValueError:
             # * this is a hack, manually incrementing the _newline_count to prevent incorrect inputs from
             # * desync-ing the linecounts in our UIBuffer
-            UIBuffer.add(
-                TextUIComponent(
-                    f"\n{ANSIEscapeSequences.BACKGROUND_RED}Invalid input{ANSIEscapeSequences.RESET} ",
-                    5,
-                )
-            )
+            UIBuffer.add(TextUIComponent(f"\n{INVALID_INPUT_STR}", 5))
     return sudoku_options
 
 